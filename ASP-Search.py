@@ -1,15 +1,28 @@
+import time
+STARTUP_PERF_COUNTER = time.perf_counter() # Captured before the remaining imports to measure cold start
+
 import os
 import urllib.request
+import urllib.error
 import json
+import csv
+import hashlib
+import re
+import plistlib
+import tempfile
+import zipfile
+import tarfile
+import multiprocessing
 import sqlite3
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import threading
+import bisect
+import concurrent.futures
 import queue
 import subprocess
-from PIL import Image, ImageTk
 import webbrowser
 
 app_name = "ASP (App Store Package) Search"
@@ -47,6 +60,118 @@ PARSING_KEYS = [
 # New constant for the metadata table
 METADATA_TABLE_NAME = "metadata"
 
+# Local App Store catalog built from a bulk metadata dump, used to resolve IDs without the network
+CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".asp-search", "catalog.db")
+CATALOG_TABLE_NAME = "catalog"
+CATALOG_IMPORT_CHUNK_SIZE = 10000 # Rows inserted per transaction while importing
+CATALOG_DELIMITERS = ["\x01", "\t", "|", ","] # Checked in order when detecting the dump's delimiter
+EPF_RECORD_SEPARATOR = "\x02\n" # Apple EPF flat files end records with STX + newline
+# Header names of the dump (lowercased) mapped to catalog columns, covering the lookup API and EPF naming
+CATALOG_COLUMN_ALIASES = {
+    "adamid": "adamId",
+    "trackid": "adamId",
+    "application_id": "adamId",
+    "id": "adamId",
+    "bundleid": "bundleId",
+    "bundle_id": "bundleId",
+    "trackname": "trackName",
+    "title": "trackName",
+    "name": "trackName",
+    "artistname": "artistName",
+    "artist_name": "artistName",
+    "sellername": "sellerName",
+    "seller_name": "sellerName",
+    "sellerurl": "sellerUrl",
+    "company_url": "sellerUrl",
+    "trackviewurl": "trackViewUrl",
+    "view_url": "trackViewUrl",
+    "releasedate": "releaseDate",
+    "itunes_release_date": "releaseDate",
+    "currentversionreleasedate": "currentVersionReleaseDate",
+    "primarygenrename": "primaryGenreName",
+    "primary_genre_name": "primaryGenreName",
+}
+CATALOG_COLUMNS = ["adamId"] + PARSING_KEYS
+DATA_SOURCE_NETWORK = "network"
+DATA_SOURCE_CATALOG_NETWORK = "catalog_network"
+DATA_SOURCE_CATALOG = "catalog"
+
+# Tables used to refresh an existing output database
+LOOKUP_STATUS_TABLE_NAME = "lookup_status" # When each app row was last checked and its HTTP validators
+VERSION_HISTORY_TABLE_NAME = "app_version_history"
+# Fields whose change adds a row to the version history table
+VERSION_HISTORY_TRACKED_KEYS = [
+    "currentVersionReleaseDate",
+    "trackName",
+    "bundleId",
+    "artistName",
+    "sellerName",
+    "primaryGenreName"
+]
+REFRESH_DEFAULT_MAX_AGE_DAYS = 30
+
+# Persistent cache of IDs the iTunes API returned no data for (removed, enterprise or sideloaded apps)
+NEGATIVE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".asp-search", "negative_cache.db")
+NEGATIVE_CACHE_TABLE_NAME = "not_found_ids"
+NEGATIVE_CACHE_TTL_DAYS = 7 # Not-found entries expire quickly since apps can be (re)published at any time
+ITUNES_STOREFRONT = "us" # Storefront the iTunes lookup API answers for when no country is given
+
+# Per-request deadline and tail-latency (hedged request) settings for iTunes API calls
+REQUEST_TIMEOUT_SECONDS = 20
+SLOW_REQUEST_PERCENTILE = 95 # Requests slower than this percentile of observed latencies are considered slow
+SLOW_REQUEST_MIN_SAMPLES = 20 # Latencies needed before the percentile is trusted
+SLOW_REQUEST_MIN_SECONDS = 1.0 # Never hedge earlier than this, even if the API is consistently fast
+RESPONSE_GRACE_SECONDS = 10 # Extra wait beyond the request timeout before a lookup is given up on
+
+# Patterns used to extract IDs from messy input lines (URLs, CSV columns, plist-style strings)
+ADAM_ID_PATTERN = re.compile(r"^\d{5,12}$") # Real AdamIDs are long, this keeps row numbers and counts out
+# App Store URLs and "id123456789" tokens, e.g. https://apps.apple.com/us/app/pages/id361309726
+ADAM_ID_URL_PATTERN = re.compile(r"(?:^|[^A-Za-z0-9])id(\d{5,12})(?!\d)|[?&]id=(\d{5,12})(?!\d)")
+ADAM_ID_STANDALONE_PATTERN = re.compile(r"(?<![\d.])\d{5,12}(?![\d.])")
+# Version strings such as 1.2.3, v1.2.3 or 1.0b2-beta look like BundleIDs but never are
+VERSION_STRING_PATTERN = re.compile(r"^[vV]?\d+(?:\.\d+)+[A-Za-z0-9\-_]*$")
+INPUT_FIELD_SEPARATORS = re.compile(r"[\s,;|\t=:<>\"'()\[\]{}]+")
+# Leading segments of reverse-DNS BundleIDs (com.example.app), also used to recognize hostnames (example.com)
+TOP_LEVEL_DOMAINS = {"com", "net", "org", "edu", "gov", "mil", "int", "io", "co", "app", "dev", "info", "biz", "me", "tv"}
+# File names (export.csv, Info.plist) split out of input lines look like two-segment BundleIDs
+FILE_NAME_EXTENSIONS = {"txt", "csv", "tsv", "json", "xml", "plist", "db", "sqlite", "log", "html", "htm", "pdf", "png", "jpg", "jpeg", "zip", "tar", "gz", "ipa", "xlsx", "xls"}
+REJECTED_INPUT_TABLE_NAME = "rejected_input"
+
+# Sources of AdamIDs/BundleIDs inside an iOS extraction (folder or archive), matched by file name
+EXTRACTION_ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz")
+HARVEST_SOURCE_FILE_NAMES = {
+    "iTunesMetadata.plist": "itunes_metadata",
+    "applicationState.db": "application_state",
+    ".com.apple.mobile_container_manager.metadata.plist": "container_metadata",
+}
+HARVEST_SOURCE_FILE_PREFIXES = {
+    "mobile_installation.log": "install_log",
+}
+HARVEST_QUEUE_SIZE = 32 # Sources read ahead of the scan workers, bounds memory on large archives
+BUNDLE_ID_PATTERN = re.compile(r"^[A-Za-z0-9\-_]+(?:\.[A-Za-z0-9\-_]+)+$")
+# MCMMetadataContentClass values of app bundle and app data containers; others are app groups, plugins, system containers
+APP_CONTAINER_CONTENT_CLASSES = (1, 2)
+# BundleIDs as written by installd, e.g. "Installing <MIInstallableBundle ID=com.example.app; ...>"
+INSTALL_LOG_BUNDLE_ID_PATTERN = re.compile(r"(?:ID=|identifier |Placeholder:|container live for |bundle ID:? )([A-Za-z0-9\-_]+(?:\.[A-Za-z0-9\-_]+)+)")
+
+# Result tables of a comparison between two output databases
+COMPARE_TABLE_NAMES = {
+    "added": "compare_added",
+    "removed": "compare_removed",
+    "changed": "compare_changed"
+}
+
+PROGRESS_UPDATE_INTERVAL_MS = 250 # Fixed refresh rate of the progress bar, independent of lookup speed
+
+# Pre-sized GUI assets, loadable by Tk's native PhotoImage (no PIL decode/resize at startup)
+ICON_IMAGE_PATHS = [
+    "assets/stark4n6_16.png",
+    "assets/stark4n6_32.png",
+    "assets/stark4n6_48.png"
+]
+LOGO_IMAGE_PATH = "assets/asp_100.png"
+LOGO_SIZE = 100
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -57,53 +182,441 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
-def set_input_id_list(set_input_id_items):
+def load_photo_image(image_path, size=None):
+    """
+    Loads an image as a Tkinter PhotoImage. Tk 8.6+ reads PNG natively; PIL is only
+    imported as a fallback for older Tk builds or non-PNG files.
+    """
+    try:
+        photo = tk.PhotoImage(file=image_path)
+        if size is None or (photo.width(), photo.height()) == size:
+            return photo
+    except tk.TclError:
+        pass
+
+    from PIL import Image, ImageTk # Deferred import, only needed when Tk can't handle the file
+    image = Image.open(image_path)
+    if size is not None and image.size != size:
+        image = image.resize(size, Image.LANCZOS)
+    return ImageTk.PhotoImage(image)
+
+def is_top_level_domain(segment):
+    """
+    Returns True if a lower-cased BundleID segment is a common generic or two-letter country TLD.
+    """
+    return segment in TOP_LEVEL_DOMAINS or (len(segment) == 2 and segment.isalpha())
+
+def canonicalize_input_id(raw_value, lookup_type):
+    """
+    Extracts and normalizes one ID of the given lookup type from a raw input line, which may be
+    a bare ID, an App Store URL, a CSV row or a plist-style string. Returns (rejection reason, ID).
+    """
+    value = raw_value.strip().strip("\"'").strip()
+    if not value:
+        return "empty line", None
+
+    if lookup_type == "adamId":
+        if ADAM_ID_PATTERN.match(value):
+            return None, value
+        # An "id" prefix (App Store URL) is explicit, otherwise any long standalone number counts
+        candidates = {match.group(1) or match.group(2) for match in ADAM_ID_URL_PATTERN.finditer(value)}
+        if not candidates:
+            candidates = set(ADAM_ID_STANDALONE_PATTERN.findall(value))
+        if len(candidates) == 1:
+            return None, candidates.pop()
+        if candidates:
+            return "more than one possible AdamID", None
+        return "no AdamID found", None
+
+    elif lookup_type == "bundleId":
+        if ADAM_ID_URL_PATTERN.search(value) and "apple.com" in value:
+            return "App Store URL contains an AdamID, use an AdamID lookup", None
+        # Drop XML tags so "<string>com.example.app</string>" splits into its value
+        candidates = {}
+        for field in INPUT_FIELD_SEPARATORS.split(re.sub(r"</?[A-Za-z]+>", " ", value)):
+            field = field.strip(".")
+            if not BUNDLE_ID_PATTERN.match(field) or not any(char.isalpha() for char in field) or VERSION_STRING_PATTERN.match(field):
+                continue
+            segments = field.lower().split(".")
+            is_reverse_dns = is_top_level_domain(segments[0])
+            if segments[-1] in FILE_NAME_EXTENSIONS and not (is_reverse_dns and len(segments) >= 3):
+                continue # A file name, e.g. export.csv or Info.plist
+            if is_top_level_domain(segments[-1]) and not is_reverse_dns:
+                continue # A hostname, e.g. www.example.com
+            candidates.setdefault(field.lower(), (field, is_reverse_dns or len(segments) >= 3))
+        # Reverse-DNS looking candidates win over other dotted tokens on the same line
+        preferred = [field for field, is_reverse_dns in candidates.values() if is_reverse_dns] or [field for field, _ in candidates.values()]
+        if len(preferred) == 1:
+            return None, preferred[0]
+        if preferred:
+            return "more than one possible BundleID", None
+        return "no BundleID found", None
+
+    return f"invalid lookup type '{lookup_type}'", None
+
+def set_input_id_list(set_input_id_items, lookup_type="adamId"):
     """
     Reads a list of IDs from a file or treats the input as a single ID.
-    Deduplicates lines if the input is a file.
+    Every line is canonicalized for the lookup type and deduplicated (BundleIDs case-insensitively,
+    keeping the first spelling). Returns (error, IDs in input order, rejected (line number, line, reason)).
     """
-    input_id_list = []
-    if os.path.exists(set_input_id_items):
+    if isinstance(set_input_id_items, list):
+        raw_lines = set_input_id_items
+    elif os.path.exists(set_input_id_items):
         try:
-            with open(set_input_id_items, 'r') as f:
-                # Use a set for deduplication
-                unique_lines = set()
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        unique_lines.add(line)
-                input_id_list = list(unique_lines) # Convert back to list
+            with open(set_input_id_items, 'r', encoding="utf-8-sig", errors="replace") as f:
+                raw_lines = f.read().splitlines()
         except Exception as e:
-            return f"error: {e}", []
-    # Check if the input is already a list (e.g., passed directly)
-    elif isinstance(set_input_id_items, list):
-        # Deduplicate the provided list
-        input_id_list = list(set(item.strip() for item in set_input_id_items if item.strip()))
+            return f"error: {e}", [], []
     else:
-        input_id_list = [set_input_id_items]
-    return None, input_id_list
+        raw_lines = [set_input_id_items]
 
-def get_data_from_itunes(lookup_value, lookup_type):
+    input_id_list = []
+    rejected_lines = []
+    seen_keys = set()
+    for line_number, raw_line in enumerate(raw_lines, start=1):
+        if not raw_line.strip():
+            continue
+        reason, canonical_id = canonicalize_input_id(raw_line, lookup_type)
+        if reason:
+            rejected_lines.append((line_number, raw_line.strip(), reason))
+            continue
+        dedup_key = canonical_id.lower() if lookup_type == "bundleId" else canonical_id
+        if dedup_key not in seen_keys:
+            seen_keys.add(dedup_key)
+            input_id_list.append(canonical_id)
+    return None, input_id_list, rejected_lines
+
+def is_extraction_input(input_value):
     """
-    Fetches application data from the iTunes API based on AdamID or BundleID.
+    Returns True if the input is an extraction folder or archive to harvest IDs from.
+    """
+    if os.path.isdir(input_value):
+        return True
+    return os.path.isfile(input_value) and input_value.lower().endswith(EXTRACTION_ARCHIVE_EXTENSIONS)
+
+def get_harvest_source_kind(file_path):
+    """
+    Returns the kind of ID source a file is (by its name), or None if it is not one.
+    """
+    file_name = os.path.basename(file_path)
+    if file_name in HARVEST_SOURCE_FILE_NAMES:
+        return HARVEST_SOURCE_FILE_NAMES[file_name]
+    for prefix, kind in HARVEST_SOURCE_FILE_PREFIXES.items():
+        if file_name.startswith(prefix):
+            return kind
+    return None
+
+def scan_harvest_source(kind, source_path=None, data=None):
+    """
+    Extracts (lookup_type, value) pairs from one ID source, given either its path or
+    its content. Runs in a worker process, so it only returns plain data.
+    """
+    found = set()
+    try:
+        if data is None:
+            with open(source_path, "rb") as f:
+                data = f.read()
+
+        if kind in ("itunes_metadata", "container_metadata"):
+            plist = plistlib.loads(data)
+            if kind == "itunes_metadata":
+                if str(plist.get("itemId", "")).isdigit():
+                    found.add(("adamId", str(plist["itemId"])))
+                bundle_id = plist.get("softwareVersionBundleId") or plist.get("bundleId")
+            else:
+                bundle_id = plist.get("MCMMetadataIdentifier")
+                content_class = plist.get("MCMMetadataContentClass")
+                if content_class is not None and content_class not in APP_CONTAINER_CONTENT_CLASSES:
+                    bundle_id = None # App group or plugin container, not an App Store app
+            if isinstance(bundle_id, str) and BUNDLE_ID_PATTERN.match(bundle_id):
+                found.add(("bundleId", bundle_id))
+
+        elif kind == "application_state":
+            # SQLite needs a real file, so archive members go through a temporary copy
+            with tempfile.TemporaryDirectory() as temp_dir:
+                db_path = os.path.join(temp_dir, "applicationState.db")
+                with open(db_path, "wb") as f:
+                    f.write(data)
+                conn = sqlite3.connect(db_path)
+                try:
+                    for (bundle_id,) in conn.execute("SELECT application_identifier FROM application_identifier_tab"):
+                        if isinstance(bundle_id, str) and BUNDLE_ID_PATTERN.match(bundle_id):
+                            found.add(("bundleId", bundle_id))
+                finally:
+                    conn.close()
+
+        elif kind == "install_log":
+            for bundle_id in INSTALL_LOG_BUNDLE_ID_PATTERN.findall(data.decode("utf-8", errors="ignore")):
+                found.add(("bundleId", bundle_id))
+    except Exception as e:
+        return f"Could not scan '{source_path}': {e}", []
+    # App group identifiers show up in every source but are never App Store apps
+    return None, [(found_type, value) for found_type, value in found if not value.startswith("group.")]
+
+def iter_extraction_sources(extraction_path):
+    """
+    Yields (kind, source_path, data) for every ID source in an extraction folder or archive.
+    Folder files are passed by path, archive members by content.
+    """
+    if os.path.isdir(extraction_path):
+        for root, _dirs, files in os.walk(extraction_path):
+            for file_name in files:
+                kind = get_harvest_source_kind(file_name)
+                if kind:
+                    yield kind, os.path.join(root, file_name), None
+    elif extraction_path.lower().endswith(".zip"):
+        with zipfile.ZipFile(extraction_path) as archive:
+            for info in archive.infolist():
+                kind = get_harvest_source_kind(info.filename)
+                if kind and not info.is_dir():
+                    yield kind, f"{extraction_path}/{info.filename}", archive.read(info)
+    else:
+        # Streamed sequentially, random access into compressed tar files is expensive
+        with tarfile.open(extraction_path, "r:*") as archive:
+            for member in archive:
+                kind = get_harvest_source_kind(member.name)
+                if kind and member.isfile():
+                    yield kind, f"{extraction_path}/{member.name}", archive.extractfile(member).read()
+
+def harvest_ids_from_extraction(extraction_path, lookup_type, max_workers=None):
+    """
+    Scans an extraction folder or archive for AdamIDs/BundleIDs using a process pool and
+    yields (error, id) tuples: deduplicated IDs of the given lookup type as soon as they
+    are found, and an error for every source that could not be scanned. IDs go through the
+    same canonicalization and (case-insensitive for BundleIDs) deduplication as list input.
+    The extraction is read on a separate thread, at most HARVEST_QUEUE_SIZE sources ahead of
+    the caller, so reading overlaps the lookups without holding a whole archive in memory.
+    """
+    seen_ids = set()
+    scans = queue.Queue(maxsize=HARVEST_QUEUE_SIZE)
+    stop_reading = threading.Event()
+
+    def read_sources(executor):
+        try:
+            for kind, source_path, data in iter_extraction_sources(extraction_path):
+                if stop_reading.is_set():
+                    return
+                scans.put((None, executor.submit(scan_harvest_source, kind, source_path, data)))
+        except Exception as e: # e.g. OSError, zipfile.BadZipFile, tarfile.TarError; reported like any unreadable source
+            scans.put((f"Could not read extraction '{extraction_path}': {e}", None))
+        finally:
+            scans.put((None, None)) # Done
+
+    # Spawned (not forked) workers, forking a process that runs a Tk GUI thread is unsafe
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        reader = threading.Thread(target=read_sources, args=(executor,), daemon=True)
+        reader.start()
+        try:
+            while True:
+                err, future = scans.get()
+                if err:
+                    yield err, None
+                    continue
+                if future is None:
+                    break
+                try:
+                    err, found = future.result()
+                except Exception as e: # e.g. a worker process died
+                    err, found = f"Extraction scan worker failed: {e}", []
+                if err:
+                    yield err, None
+                for found_type, value in found:
+                    if found_type != lookup_type:
+                        continue
+                    reason, canonical_id = canonicalize_input_id(value, lookup_type)
+                    if reason:
+                        continue
+                    dedup_key = canonical_id.lower() if lookup_type == "bundleId" else canonical_id
+                    if dedup_key not in seen_ids:
+                        seen_ids.add(dedup_key)
+                        yield None, canonical_id
+        finally:
+            # Caller stopped early (or finished), unblock the reader and drop queued scans
+            stop_reading.set()
+            while reader.is_alive() or not scans.empty():
+                try:
+                    _, future = scans.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if future is not None:
+                    future.cancel()
+
+def build_itunes_url(lookup_value, lookup_type):
+    """
+    Builds the iTunes lookup API URL for an AdamID or BundleID.
     """
-    response_json_data = None
     base_url = "http://itunes.apple.com/lookup?"
-    
+
     if lookup_type == "adamId":
-        url = f"{base_url}id={lookup_value}"
+        return None, f"{base_url}id={lookup_value}"
     elif lookup_type == "bundleId":
-        url = f"{base_url}bundleId={lookup_value}"
-    else:
-        return f"ERROR: Invalid lookup type '{lookup_type}'. Must be 'adamId' or 'bundleId'.", None
+        return None, f"{base_url}bundleId={lookup_value}"
+    return f"ERROR: Invalid lookup type '{lookup_type}'. Must be 'adamId' or 'bundleId'.", None
+
+def get_data_from_itunes(lookup_value, lookup_type, timeout=REQUEST_TIMEOUT_SECONDS):
+    """
+    Fetches application data from the iTunes API based on AdamID or BundleID.
+    The request is abandoned if no response arrives within the timeout (seconds).
+    Returns (error, data, exception type); the exception type is None on success and
+    unwraps URLError so a connect timeout reports TimeoutError like a read timeout.
+    """
+    response_json_data = None
+    err, url = build_itunes_url(lookup_value, lookup_type)
+    if err:
+        return err, None, ValueError
 
     try:
-        with urllib.request.urlopen(url) as response:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
             response_data = response.read()
             response_json_data = json.loads(response_data)
     except Exception as e:
-        return f"\nERROR fetching data for {lookup_value} ({lookup_type}): {e}", None
-    return None, response_json_data
+        error_type = type(e)
+        if isinstance(e, urllib.error.URLError) and isinstance(e.reason, BaseException):
+            error_type = type(e.reason)
+        return f"\nERROR fetching data for {lookup_value} ({lookup_type}): {e}", None, error_type
+    return None, response_json_data, None
+
+def get_data_from_itunes_conditional(lookup_value, lookup_type, etag=None, last_modified=None, timeout=REQUEST_TIMEOUT_SECONDS):
+    """
+    Fetches application data like get_data_from_itunes, sending the ETag/Last-Modified
+    validators from a previous response. Returns (error, data, validators); data is None
+    without an error when the server answers 304 Not Modified.
+    """
+    err, url = build_itunes_url(lookup_value, lookup_type)
+    if err:
+        return err, None, {}
+
+    request = urllib.request.Request(url)
+    if etag:
+        request.add_header("If-None-Match", etag)
+    if last_modified:
+        request.add_header("If-Modified-Since", last_modified)
+
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+            response_json_data = json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None, None, {"etag": etag, "last_modified": last_modified}
+        return f"\nERROR fetching data for {lookup_value} ({lookup_type}): {e}", None, {}
+    except Exception as e:
+        return f"\nERROR fetching data for {lookup_value} ({lookup_type}): {e}", None, {}
+    return None, response_json_data, validators
+
+class LatencyTracker:
+    """
+    Keeps the latency of every iTunes API lookup so slow outliers can be detected
+    (and hedged) against a percentile of what has been observed during the run.
+    """
+    def __init__(self, percentile=SLOW_REQUEST_PERCENTILE, min_samples=SLOW_REQUEST_MIN_SAMPLES, min_seconds=SLOW_REQUEST_MIN_SECONDS):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_seconds = min_seconds
+        self.latencies = [] # In request order
+        self.sorted_latencies = [] # Kept sorted on insert so percentiles don't re-sort the whole run
+        self.slow_count = 0
+        self.hedged_count = 0
+        self.hedge_wins = 0
+        self.timeout_count = 0
+
+    def get_percentile(self, percentile):
+        """Returns the given percentile (nearest-rank) of the recorded latencies, or None if empty."""
+        if not self.sorted_latencies:
+            return None
+        ordered = self.sorted_latencies
+        rank = max(0, min(len(ordered) - 1, int(round(percentile / 100 * len(ordered))) - 1))
+        return ordered[rank]
+
+    def get_slow_threshold(self):
+        """Returns the latency (seconds) above which a request counts as slow, or None until enough samples exist."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        return max(self.min_seconds, self.get_percentile(self.percentile))
+
+    def record(self, latency, timed_out=False):
+        """Records the latency of one lookup. Returns True if it was a slow outlier."""
+        threshold = self.get_slow_threshold()
+        self.latencies.append(latency)
+        bisect.insort(self.sorted_latencies, latency)
+        if timed_out:
+            self.timeout_count += 1
+        if threshold is not None and latency > threshold:
+            self.slow_count += 1
+            return True
+        return False
+
+    def get_summary_lines(self):
+        """Returns the tail-latency statistics as report lines."""
+        if not self.latencies:
+            return ["Request latency: no requests sent"]
+        lines = [
+            f"Requests timed: {len(self.latencies)}",
+            f"Latency p50: {self.get_percentile(50):.3f}s, p90: {self.get_percentile(90):.3f}s, "
+            f"p99: {self.get_percentile(99):.3f}s, max: {self.sorted_latencies[-1]:.3f}s",
+            f"Slow requests (> p{self.percentile}): {self.slow_count}, timeouts: {self.timeout_count}",
+        ]
+        if self.hedged_count:
+            lines.append(f"Hedged requests: {self.hedged_count}, won by hedge: {self.hedge_wins}")
+        return lines
+
+def get_data_from_itunes_hedged(lookup_value, lookup_type, latency_tracker, hedge_enabled):
+    """
+    Fetches application data like get_data_from_itunes, but when hedging is enabled and the
+    request runs longer than the tracker's slow threshold, a duplicate request is sent and
+    whichever answers first (successfully) wins. Latency is recorded once per ID.
+    Every request runs on its own daemon thread, so abandoned (losing or slow) requests
+    never delay later lookups, they simply end on their own deadline.
+    """
+    start = time.perf_counter()
+    responses = queue.Queue()
+
+    def fetch(is_hedge):
+        # Always answer, an exception escaping here would leave the caller waiting for a response
+        try:
+            result = get_data_from_itunes(lookup_value, lookup_type)
+        except Exception as e:
+            result = (f"\nERROR fetching data for {lookup_value} ({lookup_type}): {e}", None, type(e))
+        responses.put((is_hedge, result))
+
+    threading.Thread(target=fetch, args=(False,), daemon=True).start()
+    outstanding = 1
+    # Backstop in case a request hangs past its socket timeout (which is per read, not total)
+    deadline = start + REQUEST_TIMEOUT_SECONDS + RESPONSE_GRACE_SECONDS
+
+    hedge_delay = latency_tracker.get_slow_threshold() if hedge_enabled else None
+    if hedge_delay is not None:
+        try:
+            first_response = responses.get(timeout=hedge_delay)
+            responses.put(first_response) # Handled by the loop below
+        except queue.Empty:
+            threading.Thread(target=fetch, args=(True,), daemon=True).start()
+            outstanding += 1
+            latency_tracker.hedged_count += 1
+            deadline = time.perf_counter() + REQUEST_TIMEOUT_SECONDS + RESPONSE_GRACE_SECONDS
+
+    result = None
+    won_by_hedge = False
+    while outstanding:
+        try:
+            is_hedge, (err, data, error_type) = responses.get(timeout=max(deadline - time.perf_counter(), 0))
+        except queue.Empty:
+            if result is None:
+                result = (f"\nERROR fetching data for {lookup_value} ({lookup_type}): no response within {REQUEST_TIMEOUT_SECONDS + RESPONSE_GRACE_SECONDS} seconds", None, TimeoutError)
+            break
+        outstanding -= 1
+        if result is None or (result[0] and not err):
+            result = (err, data, error_type)
+            won_by_hedge = is_hedge
+        if not err:
+            break # A successful response is in, any outstanding duplicate is abandoned
+
+    if won_by_hedge:
+        latency_tracker.hedge_wins += 1
+    timed_out = result[2] is not None and issubclass(result[2], TimeoutError)
+    is_slow = latency_tracker.record(time.perf_counter() - start, timed_out)
+    return result[0], result[1], is_slow
 
 def parse_itunes_data(bundle_data, parsing_keys_list, original_lookup_value, lookup_type):
     """
@@ -147,6 +660,351 @@ def parse_itunes_data(bundle_data, parsing_keys_list, original_lookup_value, loo
                     parsed_results_flat[k] = v
     return parsed_results_flat
 
+def open_negative_cache(cache_path):
+    """
+    Opens (or creates) the persistent not-found cache database and drops expired entries.
+    """
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        conn = sqlite3.connect(cache_path)
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {NEGATIVE_CACHE_TABLE_NAME} (
+                lookup_type TEXT,
+                storefront TEXT,
+                lookup_value TEXT,
+                checked_at REAL,
+                PRIMARY KEY (lookup_type, storefront, lookup_value)
+            )
+        ''')
+        expiry = time.time() - NEGATIVE_CACHE_TTL_DAYS * 86400
+        cursor.execute(f"DELETE FROM {NEGATIVE_CACHE_TABLE_NAME} WHERE checked_at < ?", (expiry,))
+        conn.commit()
+    except (OSError, sqlite3.Error) as e:
+        return f"Could not open not-found cache '{cache_path}': {e}", None
+    return None, conn
+
+def get_negative_cache_ids(conn, lookup_type, storefront):
+    """
+    Returns the set of IDs known to have no App Store data for a lookup type and storefront.
+    """
+    try:
+        cursor = conn.execute(
+            f"SELECT lookup_value FROM {NEGATIVE_CACHE_TABLE_NAME} WHERE lookup_type = ? AND storefront = ?",
+            (lookup_type, storefront)
+        )
+        return None, {row[0] for row in cursor}
+    except sqlite3.Error as e:
+        return f"Could not read not-found cache: {e}", set()
+
+def add_negative_cache_ids(conn, lookup_type, storefront, lookup_values):
+    """
+    Records IDs that returned no App Store data, refreshing the timestamp of existing entries.
+    """
+    checked_at = time.time()
+    try:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {NEGATIVE_CACHE_TABLE_NAME} (lookup_type, storefront, lookup_value, checked_at) VALUES (?, ?, ?, ?)",
+            [(lookup_type, storefront, value, checked_at) for value in lookup_values]
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        return f"Could not update not-found cache: {e}"
+    return None
+
+def remove_negative_cache_ids(conn, lookup_type, storefront, lookup_values):
+    """
+    Drops cached not-found entries for IDs that now resolve to App Store data.
+    """
+    try:
+        conn.executemany(
+            f"DELETE FROM {NEGATIVE_CACHE_TABLE_NAME} WHERE lookup_type = ? AND storefront = ? AND lookup_value = ?",
+            [(lookup_type, storefront, value) for value in lookup_values]
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        return f"Could not update not-found cache: {e}"
+    return None
+
+def ensure_refresh_tables(cursor):
+    """
+    Creates the lookup status and version history tables used by refresh mode.
+    """
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {LOOKUP_STATUS_TABLE_NAME} (
+            adamId TEXT PRIMARY KEY,
+            lookup_type TEXT,
+            lookup_value TEXT,
+            last_checked TEXT,
+            etag TEXT,
+            last_modified TEXT
+        )
+    ''')
+    history_columns = ", ".join(f"{col} TEXT" for col in VERSION_HISTORY_TRACKED_KEYS)
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {VERSION_HISTORY_TABLE_NAME} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            adamId TEXT,
+            recorded_at TEXT,
+            {history_columns}
+        )
+    ''')
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{VERSION_HISTORY_TABLE_NAME}_adamId ON {VERSION_HISTORY_TABLE_NAME} (adamId)")
+
+def record_lookup_status(cursor, adam_id, lookup_type, lookup_value, validators=None):
+    """
+    Stores when an app row was last checked, with the HTTP validators of the response (if any).
+    """
+    validators = validators or {}
+    cursor.execute(
+        f"INSERT OR REPLACE INTO {LOOKUP_STATUS_TABLE_NAME} (adamId, lookup_type, lookup_value, last_checked, etag, last_modified) VALUES (?, ?, ?, ?, ?, ?)",
+        (adam_id, lookup_type, lookup_value, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), validators.get("etag"), validators.get("last_modified"))
+    )
+
+def get_refresh_lookup(row):
+    """
+    Determines the lookup type and value to refresh an app_bundle_data row with
+    (a dict of its columns), preferring the AdamID when the row has a real one.
+    """
+    adam_id = row.get("adamId")
+    if adam_id and adam_id != "N/A" and not adam_id.startswith("NO_ADAMID_"):
+        return "adamId", adam_id
+    bundle_id = row.get("bundleId")
+    if bundle_id and bundle_id != "N/A":
+        return "bundleId", bundle_id
+    return None, None
+
+def record_version_change(cursor, adam_id, old_row, new_row):
+    """
+    Adds a version history row when any tracked field differs between the stored row
+    and the refreshed one. The previous values are recorded first if the app has no history yet.
+    Returns True if a change was recorded.
+    """
+    old_values = [old_row.get(col) for col in VERSION_HISTORY_TRACKED_KEYS]
+    new_values = [new_row.get(col) for col in VERSION_HISTORY_TRACKED_KEYS]
+    if old_values == new_values:
+        return False
+
+    insert_sql = f"INSERT INTO {VERSION_HISTORY_TABLE_NAME} (adamId, recorded_at, {', '.join(VERSION_HISTORY_TRACKED_KEYS)}) VALUES (?, ?, {', '.join('?' for _ in VERSION_HISTORY_TRACKED_KEYS)})"
+    cursor.execute(f"SELECT 1 FROM {VERSION_HISTORY_TABLE_NAME} WHERE adamId = ? LIMIT 1", (adam_id,))
+    if not cursor.fetchone():
+        cursor.execute(insert_sql, (adam_id, old_row.get("_last_checked"), *old_values))
+    cursor.execute(insert_sql, (adam_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), *new_values))
+    return True
+
+def iter_catalog_dump_records(dump_file, delimiter=None):
+    """
+    Streams the records of a flat-file metadata dump as lists of fields, header first.
+    The delimiter is detected from the header line when not given. Apple EPF files
+    (SOH separated, STX + newline terminated, '#' header and comment lines) are supported.
+    """
+    header_line = dump_file.readline()
+    if delimiter is None:
+        delimiter = next((candidate for candidate in CATALOG_DELIMITERS if candidate in header_line), "\t")
+
+    if delimiter == "\x01":
+        record = header_line
+        while record:
+            # EPF records may span lines (e.g. descriptions), they only end at the record separator
+            while record and not record.endswith(EPF_RECORD_SEPARATOR):
+                next_line = dump_file.readline()
+                if not next_line:
+                    break
+                record += next_line
+            record = record.rstrip("\n").rstrip("\x02")
+            if record.startswith("##"):
+                pass # EPF legal/footer lines
+            else:
+                yield record.lstrip("#").split(delimiter)
+            record = dump_file.readline()
+    else:
+        yield next(csv.reader([header_line], delimiter=delimiter))
+        yield from csv.reader(dump_file, delimiter=delimiter)
+
+def import_catalog_dump(dump_path, catalog_path, delimiter=None, progress_callback=None):
+    """
+    Imports a bulk App Store metadata flat-file dump into the local SQLite catalog, in chunks.
+    Existing entries with the same adamId are replaced. Returns (error, imported row count).
+    """
+    conn = None
+    imported_count = 0
+    index_err = None
+    try:
+        os.makedirs(os.path.dirname(catalog_path), exist_ok=True)
+        conn = sqlite3.connect(catalog_path)
+        conn.execute("PRAGMA synchronous = OFF") # Bulk load, the dump can simply be imported again
+        column_definitions = ", ".join(f"{col} TEXT PRIMARY KEY" if col == "adamId" else f"{col} TEXT" for col in CATALOG_COLUMNS)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {CATALOG_TABLE_NAME} ({column_definitions})")
+
+        insert_sql = f"INSERT OR REPLACE INTO {CATALOG_TABLE_NAME} ({', '.join(CATALOG_COLUMNS)}) VALUES ({', '.join('?' for _ in CATALOG_COLUMNS)})"
+        with open(dump_path, "r", encoding="utf-8", errors="replace", newline="") as dump_file:
+            records = iter_catalog_dump_records(dump_file, delimiter)
+            header = next(records, None)
+            if not header:
+                return f"Catalog dump '{dump_path}' is empty", 0
+            field_positions = {}
+            for position, field_name in enumerate(header):
+                catalog_column = CATALOG_COLUMN_ALIASES.get(field_name.strip().lower())
+                if catalog_column and catalog_column not in field_positions:
+                    field_positions[catalog_column] = position
+            if "adamId" not in field_positions:
+                return f"No AdamID column found in the header of '{dump_path}'", 0
+
+            # Index is rebuilt after the load (see finally), which is faster than maintaining it per insert
+            conn.execute(f"DROP INDEX IF EXISTS idx_{CATALOG_TABLE_NAME}_bundleId")
+            conn.execute(f"DROP INDEX IF EXISTS idx_{CATALOG_TABLE_NAME}_bundleId_nocase")
+
+            chunk = []
+            for record in records:
+                values = [record[field_positions[col]] if col in field_positions and field_positions[col] < len(record) else None for col in CATALOG_COLUMNS]
+                if not values[0] or not values[0].strip().isdigit():
+                    continue # Blank or malformed line
+                values[0] = values[0].strip()
+                chunk.append(values)
+                if len(chunk) >= CATALOG_IMPORT_CHUNK_SIZE:
+                    conn.executemany(insert_sql, chunk)
+                    conn.commit()
+                    imported_count += len(chunk)
+                    chunk = []
+                    if progress_callback:
+                        progress_callback(imported_count)
+            if chunk:
+                conn.executemany(insert_sql, chunk)
+                imported_count += len(chunk)
+        conn.commit()
+    except (OSError, sqlite3.Error, csv.Error) as e:
+        return f"Could not import catalog dump '{dump_path}': {e}", imported_count
+    finally:
+        if conn:
+            # Rebuilt on every exit path, so a failed import never leaves BundleID lookups unindexed.
+            # BundleIDs match case-insensitively, like the lookup API and input deduplication
+            try:
+                conn.rollback()
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{CATALOG_TABLE_NAME}_bundleId_nocase ON {CATALOG_TABLE_NAME} (bundleId COLLATE NOCASE)")
+                conn.commit()
+            except sqlite3.Error as e:
+                index_err = f"Could not index catalog '{catalog_path}': {e}"
+            conn.close()
+    return index_err, imported_count
+
+def open_catalog(catalog_path):
+    """
+    Opens the local catalog database read-only. Returns (error, connection).
+    """
+    if not os.path.exists(catalog_path):
+        return f"Offline catalog '{catalog_path}' not found, import a metadata dump first", None
+    try:
+        conn = sqlite3.connect(f"file:{urllib.request.pathname2url(catalog_path)}?mode=ro", uri=True)
+        conn.execute(f"SELECT 1 FROM {CATALOG_TABLE_NAME} LIMIT 1")
+    except sqlite3.Error as e:
+        return f"Could not open offline catalog '{catalog_path}': {e}", None
+    return None, conn
+
+def get_data_from_catalog(conn, lookup_value, lookup_type):
+    """
+    Looks up an AdamID or BundleID in the local catalog. Returns (error, data) where data is
+    shaped like an iTunes API response (so parse_itunes_data applies), or None on a miss.
+    """
+    key_condition = "adamId = ?" if lookup_type == "adamId" else "bundleId = ? COLLATE NOCASE"
+    try:
+        row = conn.execute(
+            f"SELECT {', '.join(CATALOG_COLUMNS)} FROM {CATALOG_TABLE_NAME} WHERE {key_condition} LIMIT 1",
+            (lookup_value,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        return f"Offline catalog lookup failed for {lookup_value}: {e}", None
+    if row is None:
+        return None, None
+
+    result = {col: value for col, value in zip(CATALOG_COLUMNS, row) if value not in (None, "")}
+    result["trackId"] = result.pop("adamId")
+    return None, {"resultCount": 1, "results": [result]}
+
+def hash_fields(*values):
+    """
+    Hashes a row's field values so changed rows can be found with a single comparison.
+    None is kept distinct from an empty string.
+    """
+    joined = "\x1f".join("\x00" if value is None else str(value) for value in values)
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+def compare_output_databases(old_db_path, new_db_path, compare_db_path, table_name="app_bundle_data"):
+    """
+    Compares the app tables of two output databases by attaching both to a new comparison
+    database and writing added, removed and changed rows (matched on adamId, changes
+    detected by field hashes) to its tables. Returns (error, counts per table kind).
+    """
+    conn = None
+    counts = {}
+    try:
+        conn = sqlite3.connect(compare_db_path)
+        conn.create_function("hash_fields", -1, hash_fields, deterministic=True)
+        cursor = conn.cursor()
+        cursor.execute("ATTACH DATABASE ? AS old_run", (old_db_path,))
+        cursor.execute("ATTACH DATABASE ? AS new_run", (new_db_path,))
+
+        # Only compare columns both runs have, older outputs may use a different schema
+        run_columns = []
+        for schema in ("old_run", "new_run"):
+            cursor.execute(f"PRAGMA {schema}.table_info({table_name})")
+            run_columns.append({info[1] for info in cursor.fetchall()})
+        columns = [col for col in DESIRED_COLUMN_ORDER if col in run_columns[0] and col in run_columns[1]]
+        if "adamId" not in columns:
+            return f"Table '{table_name}' with an adamId column not found in both databases", counts
+        value_columns = [col for col in columns if col != "adamId"]
+
+        for kind in ("added", "removed"):
+            source, other = ("new_run", "old_run") if kind == "added" else ("old_run", "new_run")
+            cursor.execute(f"DROP TABLE IF EXISTS {COMPARE_TABLE_NAMES[kind]}")
+            cursor.execute(
+                f"CREATE TABLE {COMPARE_TABLE_NAMES[kind]} AS "
+                f"SELECT {', '.join('s.' + col for col in columns)} FROM {source}.{table_name} s "
+                f"LEFT JOIN {other}.{table_name} o ON o.adamId = s.adamId WHERE o.adamId IS NULL"
+            )
+
+        hash_sql = f"hash_fields({', '.join(value_columns)})"
+        changed_fields_sql = " || ".join(f"CASE WHEN o.{col} IS NOT n.{col} THEN '{col};' ELSE '' END" for col in value_columns)
+        value_pairs_sql = ", ".join(f"o.{col} AS old_{col}, n.{col} AS new_{col}" for col in value_columns)
+        cursor.execute(f"DROP TABLE IF EXISTS {COMPARE_TABLE_NAMES['changed']}")
+        cursor.execute(
+            f"CREATE TABLE {COMPARE_TABLE_NAMES['changed']} AS "
+            f"WITH o AS (SELECT adamId, {', '.join(value_columns)}, {hash_sql} AS field_hash FROM old_run.{table_name}), "
+            f"n AS (SELECT adamId, {', '.join(value_columns)}, {hash_sql} AS field_hash FROM new_run.{table_name}) "
+            f"SELECT n.adamId AS adamId, RTRIM({changed_fields_sql}, ';') AS changed_fields, "
+            f"o.field_hash AS old_hash, n.field_hash AS new_hash, {value_pairs_sql} "
+            f"FROM n JOIN o ON o.adamId = n.adamId WHERE o.field_hash != n.field_hash"
+        )
+
+        for kind, compare_table in COMPARE_TABLE_NAMES.items():
+            cursor.execute(f"SELECT COUNT(*) FROM {compare_table}")
+            counts[kind] = cursor.fetchone()[0]
+        conn.commit()
+    except sqlite3.Error as e:
+        return f"SQLite error during comparison: {e}", counts
+    finally:
+        if conn:
+            conn.close()
+    return None, counts
+
+def export_table_to_csv(db_path, table_name, csv_path):
+    """
+    Writes a table of a SQLite database to a CSV file with a header row.
+    """
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.execute(f"SELECT * FROM {table_name}")
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow([description[0] for description in cursor.description])
+            writer.writerows(cursor)
+    except (sqlite3.Error, OSError) as e:
+        return f"Could not export '{table_name}' to CSV: {e}"
+    finally:
+        if conn:
+            conn.close()
+    return None
+
 def create_and_reorder_table(conn, cursor, table_name, desired_order, existing_columns):
     """
     Creates a new SQLite table with the desired column order or reorders an existing one.
@@ -267,40 +1125,76 @@ class App(tk.Tk):
         self.resizable(False, False) 
         self.geometry("750x650") 
 
-        # --- Set application icon ---
-        # Ensure 'app_icon.png' is in the same directory as your script
-        # You can use different sizes for better display on various platforms
-        icon_path = resource_path("assets/stark4n6.ico") # Replace with your icon file name
-        if os.path.exists(icon_path):
-            try:
-                # Load the image using PIL
-                icon_image = Image.open(icon_path)
-                # Create a PhotoImage from the PIL image
-                self.icon_photo = ImageTk.PhotoImage(icon_image)
-                # Set the window icon
-                self.iconphoto(True, self.icon_photo)
-            except Exception as e:
-                print(f"Warning: Could not load application icon from '{icon_path}': {e}")
-        else:
-            print(f"Warning: Application icon file '{icon_path}' not found.")
-        # --- End icon setting ---
+        self.icon_photos = [] # To hold the PhotoImage objects for the window icon
+        self.load_icon() # Small pre-sized PNGs, cheap enough to load before the first frame
+
+        self.startup_duration = None # Seconds from process start until the first frame is drawn
 
         self.actual_output_dir = None # Stores the actual directory where files will be saved
         self.logo_tk = None # To hold the PhotoImage object for the logo
 
-        self.logo_image_path = resource_path("assets/asp.png") # Path to the logo image
+        self.logo_image_path = resource_path(LOGO_IMAGE_PATH) # Path to the pre-sized logo image
 
         self.log_queue = queue.Queue() # Queue for thread-safe logging to the Text widget
 
+        # Progress of the running lookup/refresh, written by the worker thread and drawn by update_progress()
+        self.progress_total = None # None while the number of IDs is unknown (e.g. streamed from an extraction)
+        self.progress_done = 0
+        self.progress_start = None
+        self.progress_running = False
+
         self.create_widgets()
         self.create_menu() # Call the new method to create the menu
         
-        # Start processing the log queue for GUI updates
+        # Start processing the log queue and progress bar for GUI updates
         self.process_queue() 
+        self.update_progress()
         # Redirect stdout and stderr to the custom TextRedirector
         sys.stdout = TextRedirector(self.output_text, self.log_queue)
         sys.stderr = TextRedirector(self.output_text, self.log_queue)
 
+        # Defer logo loading until the first frame is on screen
+        self.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        """
+        Runs once the main window has been drawn: loads the logo image and records
+        how long the application took to start.
+        """
+        self.update_idletasks() # Make sure the first frame is fully drawn before timing it
+        self.startup_duration = time.perf_counter() - STARTUP_PERF_COUNTER
+
+        self.load_logo()
+
+        self.log_queue.put(f"Startup time: {self.startup_duration:.3f}s\n\n")
+
+    def load_icon(self):
+        """Sets the window icon from the pre-sized PNG assets."""
+        for icon_relative_path in ICON_IMAGE_PATHS:
+            icon_path = resource_path(icon_relative_path)
+            if not os.path.exists(icon_path):
+                continue
+            try:
+                self.icon_photos.append(load_photo_image(icon_path))
+            except Exception as e:
+                print(f"Warning: Could not load application icon from '{icon_path}': {e}")
+
+        if self.icon_photos:
+            # Tk picks the best fitting size for title bar, taskbar, etc.
+            self.iconphoto(True, *self.icon_photos)
+        else:
+            print(f"Warning: No application icon files found in '{resource_path('assets')}'.")
+
+    def load_logo(self):
+        """Displays the logo image in the logo label."""
+        if self.logo_image_path and os.path.exists(self.logo_image_path):
+            try:
+                self.logo_tk = load_photo_image(self.logo_image_path, (LOGO_SIZE, LOGO_SIZE))
+                self.logo_label.config(image=self.logo_tk)
+            except Exception as e:
+                self.logo_label.config(text=f"Error loading logo: {e}", background="red", foreground="white")
+                self.log_queue.put(f"Error loading logo from '{self._format_path_for_display(self.logo_image_path)}': {e}\n")
+
     def _format_path_for_display(self, path):
         """Converts a given path to use forward slashes for display."""
         if path:
@@ -318,6 +1212,47 @@ class App(tk.Tk):
             self.output_text.see(tk.END) # Auto-scroll to the end
         self.after(100, self.process_queue) # Schedule itself to run again after 100ms
 
+    def start_progress(self, total):
+        """Resets the progress state for a new run of total IDs (None if unknown)."""
+        self.progress_total = total
+        self.progress_done = 0
+        self.progress_start = time.perf_counter()
+        self.progress_running = True
+
+    def finish_progress(self):
+        """Marks the current run as finished so the progress bar shows its final state."""
+        self.progress_total = self.progress_done
+        self.progress_running = False
+
+    def update_progress(self):
+        """
+        Redraws the progress bar and its IDs/sec and ETA label from the progress state.
+        Called periodically by Tkinter's after method, at a fixed rate.
+        """
+        if self.progress_start is not None:
+            done = self.progress_done
+            total = self.progress_total
+            elapsed = time.perf_counter() - self.progress_start
+            rate = done / elapsed if elapsed > 0 else 0.0
+
+            if total is None:
+                if self.progress_bar.cget("mode") != "indeterminate":
+                    self.progress_bar.config(mode="indeterminate")
+                self.progress_bar.step(2)
+                progress_text = f"{done} IDs - {rate:.1f} IDs/s"
+            else:
+                if self.progress_bar.cget("mode") != "determinate":
+                    self.progress_bar.config(mode="determinate")
+                self.progress_bar.config(maximum=max(total, 1), value=done)
+                progress_text = f"{done}/{total} IDs - {rate:.1f} IDs/s"
+                if self.progress_running and rate > 0:
+                    progress_text += f" - ETA {timedelta(seconds=int((total - done) / rate))}"
+            if not self.progress_running:
+                progress_text += f" - done in {timedelta(seconds=int(elapsed))}"
+                self.progress_start = None # Final state drawn, stop updating
+            self.progress_label.config(text=progress_text)
+        self.after(PROGRESS_UPDATE_INTERVAL_MS, self.update_progress)
+
     def create_menu(self):
         """
         Creates the application's menu bar with File and Help options.
@@ -328,6 +1263,9 @@ class App(tk.Tk):
         # --- File Menu ---
         file_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="Import Offline Catalog...", command=self.import_catalog_in_thread)
+        self.file_menu = file_menu # Kept to disable the import entry while a run is in progress
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.quit) # Exit the application
 
         # --- Help Menu ---
@@ -361,16 +1299,31 @@ class App(tk.Tk):
         input_frame.pack(padx=5, pady=5, fill="x", anchor="nw") 
         input_frame.grid_columnconfigure(1, weight=1) # Allows the entry widget to expand
 
-        ttk.Label(input_frame, text="AdamID/BundleID or File:").grid(row=0, column=0, sticky="w", pady=5)
+        ttk.Label(input_frame, text="AdamID/BundleID, File or Extraction:").grid(row=0, column=0, sticky="w", pady=5)
         self.input_id_entry = ttk.Entry(input_frame, width=35) 
         self.input_id_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
         ttk.Button(input_frame, text="Browse File", command=self.browse_file).grid(row=0, column=2, padx=5, pady=5)
+        ttk.Button(input_frame, text="Browse Folder", command=self.browse_extraction_folder).grid(row=0, column=3, padx=5, pady=5)
 
         ttk.Label(input_frame, text="Lookup Type:").grid(row=1, column=0, sticky="w", pady=5)
         self.lookup_type_var = tk.StringVar(value="adamId")
         ttk.Radiobutton(input_frame, text="AdamID", variable=self.lookup_type_var, value="adamId").grid(row=1, column=1, sticky="w")
         ttk.Radiobutton(input_frame, text="BundleID", variable=self.lookup_type_var, value="bundleId").grid(row=1, column=1, padx=80, sticky="w")
 
+        self.use_negative_cache_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(input_frame, text=f"Skip IDs not found in the last {NEGATIVE_CACHE_TTL_DAYS} days", variable=self.use_negative_cache_var).grid(row=2, column=0, columnspan=3, sticky="w", pady=5)
+
+        self.hedge_requests_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(input_frame, text=f"Send a duplicate request when a lookup is slower than p{SLOW_REQUEST_PERCENTILE}", variable=self.hedge_requests_var).grid(row=3, column=0, columnspan=3, sticky="w")
+
+        ttk.Label(input_frame, text="Data Source:").grid(row=4, column=0, sticky="w", pady=5)
+        self.data_source_var = tk.StringVar(value=DATA_SOURCE_CATALOG_NETWORK)
+        data_source_frame = ttk.Frame(input_frame)
+        data_source_frame.grid(row=4, column=1, columnspan=3, sticky="w")
+        ttk.Radiobutton(data_source_frame, text="Network", variable=self.data_source_var, value=DATA_SOURCE_NETWORK).pack(side="left")
+        ttk.Radiobutton(data_source_frame, text="Catalog + Network", variable=self.data_source_var, value=DATA_SOURCE_CATALOG_NETWORK).pack(side="left", padx=10)
+        ttk.Radiobutton(data_source_frame, text="Catalog Only", variable=self.data_source_var, value=DATA_SOURCE_CATALOG).pack(side="left")
+
         # Output Options Frame - Now inside left_panel_frame
         output_options_frame = ttk.LabelFrame(left_panel_frame, text="Output Options", padding="10")
         output_options_frame.pack(padx=5, pady=5, fill="x", anchor="nw") 
@@ -393,21 +1346,13 @@ class App(tk.Tk):
         self.browse_output_folder_button = ttk.Button(output_options_frame, text="Browse Folder", command=self.browse_output_folder, state=tk.DISABLED) 
         self.browse_output_folder_button.grid(row=1, column=5, padx=5, pady=5) 
 
+        self.console_details_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(output_options_frame, text="Per-ID console details (off = quiet: aggregates and errors only)", variable=self.console_details_var).grid(row=2, column=0, columnspan=6, sticky="w", pady=5)
+
         # Logo Label (replaces the logo_frame and now directly displays the image)
-        logo_size = 100 
+        # The image itself is loaded by load_logo() once the first frame is drawn
         self.logo_label = ttk.Label(main_container_frame, anchor="center")
         self.logo_label.pack(side="right", anchor="ne", padx=10, pady=5)
-        
-        # Load and display logo, resizing to fit the square area
-        if self.logo_image_path and os.path.exists(self.logo_image_path):
-            try:
-                original_image = Image.open(self.logo_image_path)
-                resized_image = original_image.resize((logo_size, logo_size), Image.LANCZOS) 
-                self.logo_tk = ImageTk.PhotoImage(resized_image)
-                self.logo_label.config(image=self.logo_tk)
-            except Exception as e:
-                self.logo_label.config(text=f"Error loading logo: {e}", background="red", foreground="white") 
-                self.log_queue.put(f"Error loading logo from '{self._format_path_for_display(self.logo_image_path)}': {e}\n")
 
         # End Logo Handling
 
@@ -418,9 +1363,25 @@ class App(tk.Tk):
         self.run_button = ttk.Button(buttons_frame, text="Run Lookup", command=self.run_lookup_in_thread)
         self.run_button.pack(side="left", padx=5)
 
+        self.refresh_button = ttk.Button(buttons_frame, text="Refresh Existing DB", command=self.refresh_db_in_thread)
+        self.refresh_button.pack(side="left", padx=5)
+
+        self.compare_button = ttk.Button(buttons_frame, text="Compare DBs", command=self.compare_dbs_in_thread)
+        self.compare_button.pack(side="left", padx=5)
+
         self.save_log_button = ttk.Button(buttons_frame, text="Save Console Log", command=self.save_log, state=tk.DISABLED)
         self.save_log_button.pack(side="left", padx=5)
 
+        # Progress bar with rate and ETA (updated by update_progress)
+        progress_frame = ttk.Frame(self)
+        progress_frame.pack(padx=10, fill="x")
+
+        self.progress_bar = ttk.Progressbar(progress_frame, orient="horizontal", mode="determinate")
+        self.progress_bar.pack(side="left", fill="x", expand=True)
+
+        self.progress_label = ttk.Label(progress_frame, text="", width=45, anchor="e")
+        self.progress_label.pack(side="right", padx=5)
+
         # Output Text Area with Scrollbar (remains below buttons_frame)
         output_text_frame = ttk.Frame(self)
         output_text_frame.pack(padx=10, pady=10, fill="both", expand=True)
@@ -460,12 +1421,21 @@ class App(tk.Tk):
         """
         file_path = filedialog.askopenfilename(
             title="Select Input ID File",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
+            filetypes=[("Text files", "*.txt"), ("Extraction archives", "*.zip *.tar *.tar.gz *.tgz"), ("All files", "*.*")]
         )
         if file_path:
             self.input_id_entry.delete(0, tk.END)
             self.input_id_entry.insert(0, file_path)
 
+    def browse_extraction_folder(self):
+        """
+        Opens a directory dialog for the user to select an iOS extraction folder to harvest IDs from.
+        """
+        folder_selected = filedialog.askdirectory(title="Select Extraction Folder")
+        if folder_selected:
+            self.input_id_entry.delete(0, tk.END)
+            self.input_id_entry.insert(0, folder_selected)
+
     def browse_output_folder(self):
         """
         Opens a directory dialog for the user to select an output folder.
@@ -477,6 +1447,49 @@ class App(tk.Tk):
             self.output_folder_var.set(folder_selected)
             self.output_folder_entry.config(state=tk.DISABLED) 
 
+    def _report_rejected_input(self, rejected_lines, conn, console_details, timestamp):
+        """
+        Reports input lines that did not contain a valid ID (and were not sent to the API)
+        as a CSV file and database table when an output folder is used, and in the console.
+        """
+        self.log_queue.put(f"Rejected {len(rejected_lines)} input lines without a valid ID, not sent to the API.\n")
+        if console_details or not self.actual_output_dir:
+            for line_number, raw_line, reason in rejected_lines:
+                self.log_queue.put(f"Rejected line {line_number}: {raw_line} ({reason})\n")
+
+        if self.actual_output_dir:
+            report_filename = os.path.join(self.actual_output_dir, f"asp-search_rejected_input_{timestamp}.csv")
+            try:
+                with open(report_filename, "w", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    writer.writerow(["line_number", "input", "reason"])
+                    writer.writerows(rejected_lines)
+                self.log_queue.put(f"Rejected input report saved to: {self._format_path_for_display(report_filename)}\n")
+            except OSError as e:
+                self.log_queue.put(f"ERROR: Could not write rejected input report: {e}\n")
+
+        if conn:
+            try:
+                conn.execute(f"CREATE TABLE IF NOT EXISTS {REJECTED_INPUT_TABLE_NAME} (line_number INTEGER, input TEXT, reason TEXT)")
+                conn.executemany(f"INSERT INTO {REJECTED_INPUT_TABLE_NAME} (line_number, input, reason) VALUES (?, ?, ?)", rejected_lines)
+                conn.commit()
+            except sqlite3.Error as e:
+                self.log_queue.put(f"Error storing rejected input lines: {e}\n")
+        self.log_queue.put("\n")
+
+    def _iter_harvested_ids(self, extraction_path, lookup_type):
+        """
+        Yields the IDs harvested from an extraction, logging sources that could not be scanned.
+        """
+        harvested_count = 0
+        for err, harvested_id in harvest_ids_from_extraction(extraction_path, lookup_type):
+            if err:
+                self.log_queue.put(f"Warning: {err}\n")
+            else:
+                harvested_count += 1
+                yield harvested_id
+        self.log_queue.put(f"Extraction scan finished: {harvested_count} unique {lookup_type}s found.\n")
+
     def run_lookup_in_thread(self):
         """
         Initiates the lookup process in a separate thread to keep the GUI responsive.
@@ -485,6 +1498,9 @@ class App(tk.Tk):
         
         # Disable buttons during lookup
         self.run_button.config(state=tk.DISABLED)
+        self.refresh_button.config(state=tk.DISABLED)
+        self.compare_button.config(state=tk.DISABLED)
+        self.file_menu.entryconfig("Import Offline Catalog...", state=tk.DISABLED)
         self.save_log_button.config(state=tk.DISABLED)
 
         self.actual_output_dir = None # Reset actual output directory
@@ -502,10 +1518,17 @@ class App(tk.Tk):
         lookup_type = self.lookup_type_var.get()
         output_format = self.output_format_var.get()
         selected_output_directory = self.output_folder_var.get()
+        use_negative_cache = self.use_negative_cache_var.get()
+        hedge_requests = self.hedge_requests_var.get()
+        console_details = self.console_details_var.get()
+        data_source = self.data_source_var.get()
 
         if not input_id_value:
             self.log_queue.put("ERROR: Please provide an AdamID/BundleID or a file path.\n")
             self.after(100, lambda: self.run_button.config(state=tk.NORMAL))
+            self.after(100, lambda: self.refresh_button.config(state=tk.NORMAL))
+            self.after(100, lambda: self.compare_button.config(state=tk.NORMAL))
+            self.after(100, lambda: self.file_menu.entryconfig("Import Offline Catalog...", state=tk.NORMAL))
             self.after(100, lambda: self.save_log_button.config(state=tk.NORMAL))
             return
 
@@ -599,6 +1622,10 @@ class App(tk.Tk):
                     conn.commit()
                     self.log_queue.put(f"Metadata (header details) stored in '{METADATA_TABLE_NAME}' table.\n")
 
+                    # Track when each row was checked so the database can be refreshed later
+                    ensure_refresh_tables(cursor)
+                    conn.commit()
+
 
                     # Check and reorder/create app_bundle_data table if schema mismatch or table doesn't exist
                     cursor.execute(f"PRAGMA table_info({table_name})")
@@ -636,32 +1663,104 @@ class App(tk.Tk):
             else:
                 self.log_queue.put("ERROR: Database filename not determined. Skipping database output.\n")
 
-        # Get the list of IDs to process (and deduplicate)
-        error, input_id_list = set_input_id_list(input_id_value)
+        # Get the IDs to process (and deduplicate), either streamed from an extraction or from a list
+        if is_extraction_input(input_id_value):
+            self.log_queue.put(f"Scanning extraction for {lookup_type}s: {self._format_path_for_display(input_id_value)}\n")
+            error, input_id_list = None, self._iter_harvested_ids(input_id_value, lookup_type)
+            total_unique_ids = None # Unknown until the scan finishes
+        else:
+            error, input_id_list, rejected_lines = set_input_id_list(input_id_value, lookup_type)
+            total_unique_ids = len(input_id_list) # This is the total number of unique IDs
+            if rejected_lines:
+                self._report_rejected_input(rejected_lines, conn, console_details, start_time.strftime(time_format_filename))
         if error:
             self.log_queue.put(f"ERROR: {error}\n")
             self.after(100, lambda: self.run_button.config(state=tk.NORMAL))
+            self.after(100, lambda: self.refresh_button.config(state=tk.NORMAL))
+            self.after(100, lambda: self.compare_button.config(state=tk.NORMAL))
+            self.after(100, lambda: self.file_menu.entryconfig("Import Offline Catalog...", state=tk.NORMAL))
             self.after(100, lambda: self.save_log_button.config(state=tk.NORMAL))
             self.after(200, self.show_completion_popup)
             return
         
-        if not input_id_list:
+        if total_unique_ids == 0:
             self.log_queue.put("No valid IDs found to process after deduplication (if applicable).\n")
             self.after(100, lambda: self.run_button.config(state=tk.NORMAL))
+            self.after(100, lambda: self.refresh_button.config(state=tk.NORMAL))
+            self.after(100, lambda: self.compare_button.config(state=tk.NORMAL))
+            self.after(100, lambda: self.file_menu.entryconfig("Import Offline Catalog...", state=tk.NORMAL))
             self.after(100, lambda: self.save_log_button.config(state=tk.NORMAL))
             self.after(200, self.show_completion_popup)
             return
 
+        # Load IDs already known to have no App Store data. They are only skipped when the option is
+        # checked, but the cache is always kept up to date so a forced re-check also refreshes it
+        negative_cache_conn = None
+        negative_cached_ids = set()
+        newly_not_found_ids = []
+        resolved_cached_ids = []
+        cache_err, negative_cache_conn = open_negative_cache(NEGATIVE_CACHE_PATH)
+        if cache_err:
+            self.log_queue.put(f"Warning: {cache_err}. Continuing without not-found cache.\n")
+        else:
+            cache_err, negative_cached_ids = get_negative_cache_ids(negative_cache_conn, lookup_type, ITUNES_STOREFRONT)
+            if cache_err:
+                self.log_queue.put(f"Warning: {cache_err}\n")
+
+        # Open the offline catalog so most IDs resolve locally, with the network only for misses
+        catalog_conn = None
+        if data_source != DATA_SOURCE_NETWORK:
+            catalog_err, catalog_conn = open_catalog(CATALOG_PATH)
+            # A catalog that was never imported is only worth a warning when it's the sole data source
+            if catalog_err and (os.path.exists(CATALOG_PATH) or data_source == DATA_SOURCE_CATALOG):
+                self.log_queue.put(f"Warning: {catalog_err}.\n")
+
         processed_results_for_output = {}
-        total_unique_ids = len(input_id_list) # This is the total number of unique IDs
+        skipped_cached_count = 0
+        catalog_hit_count = 0
+        latency_tracker = LatencyTracker()
 
         # Process each ID
-        for i, current_id in enumerate(input_id_list):
-            current_lookup_num = i + 1
-            self.log_queue.put(f"Processing ID: {current_id} ({current_lookup_num}/{total_unique_ids})\n")
-            err, bundleID_data = get_data_from_itunes(current_id, lookup_type)
+        self.start_progress(total_unique_ids)
+        current_lookup_num = 0
+        result_counts = {"found": 0, "not_found": 0, "errors": 0}
+        for current_id in input_id_list:
+            current_lookup_num += 1
+            progress = f"{current_lookup_num}/{total_unique_ids}" if total_unique_ids is not None else f"{current_lookup_num}"
+            catalog_data = None
+            if catalog_conn:
+                err, catalog_data = get_data_from_catalog(catalog_conn, current_id, lookup_type)
+                if err:
+                    self.log_queue.put(f"Warning: {err}\n")
+
+            if catalog_data is not None:
+                if console_details:
+                    self.log_queue.put(f"Processing ID: {current_id} ({progress}) - offline catalog\n")
+                catalog_hit_count += 1
+                err, bundleID_data = None, catalog_data
+            elif data_source == DATA_SOURCE_CATALOG:
+                # Catalog only, a miss is not proof the app doesn't exist so it isn't cached as not found
+                err, bundleID_data = f"Not found in offline catalog: {current_id} (lookup by {lookup_type})", None
+            elif use_negative_cache and current_id in negative_cached_ids:
+                # Known not-found ID, reuse an empty API response instead of requesting it again
+                if console_details:
+                    self.log_queue.put(f"Skipping ID: {current_id} ({progress}) - not found in a previous run\n")
+                skipped_cached_count += 1
+                err, bundleID_data = None, {"resultCount": 0, "results": []}
+            else:
+                if console_details:
+                    self.log_queue.put(f"Processing ID: {current_id} ({progress})\n")
+                err, bundleID_data, is_slow = get_data_from_itunes_hedged(current_id, lookup_type, latency_tracker, hedge_requests)
+                if is_slow and console_details: # Counted in the latency summary either way
+                    self.log_queue.put(f"Slow request: {current_id} took {latency_tracker.latencies[-1]:.3f}s\n")
+                if not err and bundleID_data is not None and bundleID_data.get("resultCount") == 0:
+                    newly_not_found_ids.append(current_id)
+
+            if current_id in negative_cached_ids and not err and bundleID_data is not None and bundleID_data.get("resultCount", 0) > 0:
+                resolved_cached_ids.append(current_id)
             if err:
                 self.log_queue.put(err + "\n")
+                result_counts["errors"] += 1
                 # Create a placeholder entry for failed lookups
                 if lookup_type == "adamId":
                     parsed_results = {"adamId": current_id, "bundleId": "N/A", "error_message": err}
@@ -673,6 +1772,7 @@ class App(tk.Tk):
 
             elif bundleID_data is not None:
                 flat_parsed_data = parse_itunes_data(bundleID_data, PARSING_KEYS, current_id, lookup_type)
+                result_counts["not_found" if bundleID_data.get("resultCount") == 0 else "found"] += 1
                 
                 # Determine the key for output dictionary based on lookup type or actual AdamId/BundleId
                 if lookup_type == "adamId":
@@ -710,12 +1810,36 @@ class App(tk.Tk):
 
                     try:
                         cursor.execute(insert_sql, tuple(values))
+                        record_lookup_status(cursor, db_adam_id_for_pk, lookup_type, current_id)
                         conn.commit()
                     except sqlite3.Error as e:
                         self.log_queue.put(f"Error inserting data for {db_adam_id_for_pk}: {e}\n")
                         
             else:
                 self.log_queue.put(f"Skipping processing and output for {current_id}: Failed to fetch data from iTunes API (unknown error).\n")
+                result_counts["errors"] += 1
+
+            self.progress_done = current_lookup_num
+
+        self.finish_progress()
+
+        if catalog_conn:
+            catalog_conn.close()
+
+        if current_lookup_num == 0:
+            self.log_queue.put("No valid IDs found to process after deduplication (if applicable).\n")
+
+        # Persist IDs that returned no data during this run
+        if negative_cache_conn:
+            if newly_not_found_ids:
+                cache_err = add_negative_cache_ids(negative_cache_conn, lookup_type, ITUNES_STOREFRONT, newly_not_found_ids)
+                if cache_err:
+                    self.log_queue.put(f"Warning: {cache_err}\n")
+            if resolved_cached_ids:
+                cache_err = remove_negative_cache_ids(negative_cache_conn, lookup_type, ITUNES_STOREFRONT, resolved_cached_ids)
+                if cache_err:
+                    self.log_queue.put(f"Warning: {cache_err}\n")
+            negative_cache_conn.close()
 
         # Write processed results to the text output stream (file)
         if report_output_stream: # This will be true only if 'txt' or 'both' and file was successfully opened
@@ -737,12 +1861,14 @@ class App(tk.Tk):
             duration = end_time - start_time
             report_output_stream.write(f"--- Lookup Finished ---\n")
             report_output_stream.write(f"Total time taken: {duration}\n")
+            for line in latency_tracker.get_summary_lines():
+                report_output_stream.write(f"{line}\n")
             report_output_stream.write(f"Timestamp: {end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
 
         # Write processed results to the console output (GUI Text widget)
         # This block now handles console output for both AdamID and BundleID uniformly
-        # This will always execute for displaying results in the GUI console
-        for key_for_output_dict, data_to_write in processed_results_for_output.items():
+        # Skipped in quiet mode, where only the aggregates below are shown
+        for key_for_output_dict, data_to_write in (processed_results_for_output.items() if console_details else []):
             display_id_for_header = key_for_output_dict # Use the dictionary key which should be the AdamId or original BundleId
             
             self.log_queue.put(f"--- Data for {lookup_type}: {display_id_for_header} ---\n")
@@ -761,7 +1887,14 @@ class App(tk.Tk):
         duration = end_time - start_time
         self.log_queue.put(f"--- Lookup Finished ---\n")
         self.log_queue.put(f"Total time taken: {duration}\n")
+        self.log_queue.put(f"IDs processed: {current_lookup_num}, found: {result_counts['found']}, not found: {result_counts['not_found']}, errors: {result_counts['errors']}\n")
+        for line in latency_tracker.get_summary_lines():
+            self.log_queue.put(f"{line}\n")
         self.log_queue.put(f"Timestamp: {end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        if catalog_conn:
+            self.log_queue.put(f"Resolved from offline catalog: {catalog_hit_count}\n")
+        if negative_cache_conn:
+            self.log_queue.put(f"Skipped (not-found cache): {skipped_cached_count}, newly not found: {len(newly_not_found_ids)}, no longer not found: {len(resolved_cached_ids)}\n")
         self.log_queue.put("Lookup process completed.\n")
 
         # Update metadata table with end time and duration
@@ -771,6 +1904,19 @@ class App(tk.Tk):
                 duration_str = str(duration)
                 cursor.execute(f"INSERT OR REPLACE INTO {METADATA_TABLE_NAME} (key, value) VALUES (?, ?)", ("LookupEndTime", end_time_str))
                 cursor.execute(f"INSERT OR REPLACE INTO {METADATA_TABLE_NAME} (key, value) VALUES (?, ?)", ("TotalDuration", duration_str))
+                if latency_tracker.latencies:
+                    latency_items = {
+                        "RequestCount": str(len(latency_tracker.latencies)),
+                        "LatencyP50": f"{latency_tracker.get_percentile(50):.3f}",
+                        "LatencyP90": f"{latency_tracker.get_percentile(90):.3f}",
+                        "LatencyP99": f"{latency_tracker.get_percentile(99):.3f}",
+                        "LatencyMax": f"{max(latency_tracker.latencies):.3f}",
+                        "SlowRequests": str(latency_tracker.slow_count),
+                        "TimedOutRequests": str(latency_tracker.timeout_count),
+                        "HedgedRequests": str(latency_tracker.hedged_count),
+                    }
+                    for key, value in latency_items.items():
+                        cursor.execute(f"INSERT OR REPLACE INTO {METADATA_TABLE_NAME} (key, value) VALUES (?, ?)", (key, value))
                 conn.commit()
                 self.log_queue.put(f"\nFinal metadata (end time, duration) stored in '{METADATA_TABLE_NAME}' table.\n")
             except sqlite3.Error as e:
@@ -794,10 +1940,357 @@ class App(tk.Tk):
         
         # Re-enable buttons after lookup is complete
         self.after(100, lambda: self.run_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.refresh_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.compare_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.file_menu.entryconfig("Import Offline Catalog...", state=tk.NORMAL))
         self.after(100, lambda: self.save_log_button.config(state=tk.NORMAL))
         self.after(200, self.show_completion_popup) # Call the modified completion popup
 
 
+    def refresh_db_in_thread(self):
+        """
+        Asks for an existing output database and a maximum age, then re-queries the
+        stale rows in a separate thread to keep the GUI responsive.
+        """
+        db_path = filedialog.askopenfilename(
+            title="Select Output Database to Refresh",
+            filetypes=[("SQLite DB", "*.db"), ("All files", "*.*")]
+        )
+        if not db_path:
+            return
+        max_age_days = simpledialog.askinteger(
+            "Refresh Threshold",
+            "Re-query apps last checked more than this many days ago:",
+            initialvalue=REFRESH_DEFAULT_MAX_AGE_DAYS,
+            minvalue=0,
+            parent=self
+        )
+        if max_age_days is None:
+            return
+
+        self.output_text.delete(1.0, tk.END) # Clear previous output
+
+        # Disable buttons during refresh
+        self.run_button.config(state=tk.DISABLED)
+        self.refresh_button.config(state=tk.DISABLED)
+        self.compare_button.config(state=tk.DISABLED)
+        self.file_menu.entryconfig("Import Offline Catalog...", state=tk.DISABLED)
+        self.save_log_button.config(state=tk.DISABLED)
+
+        self.actual_output_dir = os.path.dirname(db_path)
+
+        thread = threading.Thread(target=self._run_refresh, args=(db_path, max_age_days, self.console_details_var.get()))
+        thread.start()
+
+    def _run_refresh(self, db_path, max_age_days, console_details=True):
+        """
+        Re-queries only the rows of an existing output database whose last check is older
+        than max_age_days, using conditional requests where the API supports them.
+        Changes to tracked fields are recorded in the version history table.
+        This method runs in a separate thread.
+        """
+        table_name = "app_bundle_data"
+        start_time = datetime.now()
+        cutoff_str = (start_time - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+
+        self.log_queue.put(f"{app_name} {version}\n")
+        self.log_queue.put(f"https://github.com/stark4n6/asp-search\n")
+        self.log_queue.put(f"--- Refresh Started ---\n")
+        self.log_queue.put(f"Start: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self.log_queue.put(f"Database: {self._format_path_for_display(db_path)}\n")
+        self.log_queue.put(f"Re-querying rows last checked before: {cutoff_str}\n\n")
+
+        conn = None
+        counts = {"checked": 0, "not_modified": 0, "unchanged": 0, "changed": 0, "not_found": 0, "errors": 0, "skipped": 0}
+        try:
+            conn = sqlite3.connect(db_path)
+            cursor = conn.cursor()
+
+            cursor.execute(f"PRAGMA table_info({table_name})")
+            existing_column_names = [info[1] for info in cursor.fetchall()]
+            if "adamId" not in existing_column_names:
+                raise sqlite3.Error(f"Table '{table_name}' with an adamId column not found")
+            select_columns = [col for col in DESIRED_COLUMN_ORDER if col in existing_column_names]
+
+            ensure_refresh_tables(cursor)
+            conn.commit()
+
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            total_rows = cursor.fetchone()[0]
+
+            cursor.execute(
+                f"SELECT {', '.join('a.' + col for col in select_columns)}, s.lookup_type, s.lookup_value, s.last_checked, s.etag, s.last_modified "
+                f"FROM {table_name} a LEFT JOIN {LOOKUP_STATUS_TABLE_NAME} s ON a.adamId = s.adamId "
+                f"WHERE s.last_checked IS NULL OR s.last_checked < ?",
+                (cutoff_str,)
+            )
+            stale_rows = cursor.fetchall()
+            self.log_queue.put(f"{len(stale_rows)} of {total_rows} rows are stale.\n\n")
+
+            self.start_progress(len(stale_rows))
+            for i, stale_row in enumerate(stale_rows):
+                self.progress_done = i # Rows skipped via continue still count once the next one starts
+                row = dict(zip(select_columns, stale_row))
+                status_lookup_type, status_lookup_value, last_checked, etag, last_modified = stale_row[len(select_columns):]
+                row["_last_checked"] = last_checked
+                db_adam_id_for_pk = row["adamId"]
+
+                if status_lookup_type and status_lookup_value:
+                    lookup_type, lookup_value = status_lookup_type, status_lookup_value
+                else:
+                    lookup_type, lookup_value = get_refresh_lookup(row)
+                if not lookup_type:
+                    self.log_queue.put(f"Skipping row {db_adam_id_for_pk}: no AdamID or BundleID to look up.\n")
+                    counts["skipped"] += 1
+                    continue
+
+                if console_details:
+                    self.log_queue.put(f"Refreshing ID: {lookup_value} ({i + 1}/{len(stale_rows)})\n")
+                counts["checked"] += 1
+                err, bundleID_data, validators = get_data_from_itunes_conditional(lookup_value, lookup_type, etag, last_modified)
+                if err:
+                    # Leave last_checked untouched so the row is retried on the next refresh
+                    self.log_queue.put(err + "\n")
+                    counts["errors"] += 1
+                    continue
+
+                if bundleID_data is None:
+                    counts["not_modified"] += 1
+                elif bundleID_data.get("resultCount") == 0:
+                    # Keep the last known data, only flag that the app is no longer available
+                    flat_parsed_data = parse_itunes_data(bundleID_data, PARSING_KEYS, lookup_value, lookup_type)
+                    cursor.execute(f"UPDATE {table_name} SET error_message = ? WHERE adamId = ?", (flat_parsed_data["error_message"], db_adam_id_for_pk))
+                    counts["not_found"] += 1
+                else:
+                    flat_parsed_data = parse_itunes_data(bundleID_data, PARSING_KEYS, lookup_value, lookup_type)
+                    new_adam_id = flat_parsed_data.get("adamId")
+                    if new_adam_id == "N/A" or new_adam_id is None:
+                        new_adam_id = db_adam_id_for_pk
+                        flat_parsed_data["adamId"] = new_adam_id
+
+                    if all(row.get(col) == flat_parsed_data.get(col) for col in select_columns):
+                        counts["unchanged"] += 1
+                    else:
+                        if new_adam_id != db_adam_id_for_pk:
+                            # A BundleID-only row resolved to a real AdamID, move it to the new key
+                            cursor.execute(f"DELETE FROM {table_name} WHERE adamId = ?", (db_adam_id_for_pk,))
+                            cursor.execute(f"DELETE FROM {LOOKUP_STATUS_TABLE_NAME} WHERE adamId = ?", (db_adam_id_for_pk,))
+                        if record_version_change(cursor, new_adam_id, row, flat_parsed_data):
+                            self.log_queue.put(f"Version history updated for: {lookup_value}\n")
+                        counts["changed"] += 1
+
+                        insert_sql = f"INSERT OR REPLACE INTO {table_name} ({', '.join(select_columns)}) VALUES ({', '.join('?' for _ in select_columns)})"
+                        cursor.execute(insert_sql, tuple(flat_parsed_data.get(col) for col in select_columns))
+                    db_adam_id_for_pk = new_adam_id
+
+                record_lookup_status(cursor, db_adam_id_for_pk, lookup_type, lookup_value, validators)
+                conn.commit()
+
+            end_time = datetime.now()
+            metadata_items = {
+                "LastRefreshTime": end_time.strftime('%Y-%m-%d %H:%M:%S'),
+                "LastRefreshMaxAgeDays": str(max_age_days),
+                "LastRefreshDuration": str(end_time - start_time),
+            }
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {METADATA_TABLE_NAME} (key TEXT PRIMARY KEY, value TEXT)")
+            for key, value in metadata_items.items():
+                cursor.execute(f"INSERT OR REPLACE INTO {METADATA_TABLE_NAME} (key, value) VALUES (?, ?)", (key, value))
+            conn.commit()
+        except sqlite3.Error as e:
+            self.log_queue.put(f"SQLite error during refresh: {e}\n")
+        finally:
+            if conn:
+                conn.close()
+            if self.progress_running:
+                self.progress_done = counts["checked"] + counts["skipped"]
+                self.finish_progress()
+
+        end_time = datetime.now()
+        self.log_queue.put(f"\n--- Refresh Finished ---\n")
+        self.log_queue.put(f"Total time taken: {end_time - start_time}\n")
+        self.log_queue.put(f"Timestamp: {end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self.log_queue.put(
+            f"Checked: {counts['checked']}, not modified: {counts['not_modified']}, unchanged: {counts['unchanged']}, "
+            f"changed: {counts['changed']}, no longer found: {counts['not_found']}, errors: {counts['errors']}, skipped: {counts['skipped']}\n"
+        )
+        self.log_queue.put("Refresh process completed.\n")
+
+        self.after(100, lambda: self.run_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.refresh_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.compare_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.file_menu.entryconfig("Import Offline Catalog...", state=tk.NORMAL))
+        self.after(100, lambda: self.save_log_button.config(state=tk.NORMAL))
+        self.after(200, self.show_completion_popup)
+
+    def import_catalog_in_thread(self):
+        """
+        Asks for a bulk App Store metadata dump and imports it into the offline catalog
+        in a separate thread to keep the GUI responsive.
+        """
+        dump_path = filedialog.askopenfilename(
+            title="Select App Store Metadata Dump",
+            filetypes=[("Flat files", "*.txt *.tsv *.csv *.psv"), ("All files", "*.*")]
+        )
+        if not dump_path:
+            return
+
+        self.output_text.delete(1.0, tk.END) # Clear previous output
+
+        # Disable buttons during import
+        self.run_button.config(state=tk.DISABLED)
+        self.refresh_button.config(state=tk.DISABLED)
+        self.compare_button.config(state=tk.DISABLED)
+        self.file_menu.entryconfig("Import Offline Catalog...", state=tk.DISABLED)
+        self.save_log_button.config(state=tk.DISABLED)
+
+        self.actual_output_dir = None # Nothing to open, the catalog lives in the user profile
+
+        thread = threading.Thread(target=self._run_catalog_import, args=(dump_path,))
+        thread.start()
+
+    def _run_catalog_import(self, dump_path):
+        """
+        Imports a metadata dump into the offline catalog. This method runs in a separate thread.
+        """
+        start_time = datetime.now()
+        self.log_queue.put(f"{app_name} {version}\n")
+        self.log_queue.put(f"https://github.com/stark4n6/asp-search\n")
+        self.log_queue.put(f"--- Catalog Import Started ---\n")
+        self.log_queue.put(f"Start: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self.log_queue.put(f"Dump: {self._format_path_for_display(dump_path)}\n")
+        self.log_queue.put(f"Catalog: {self._format_path_for_display(CATALOG_PATH)}\n\n")
+
+        self.start_progress(None)
+        def on_progress(imported_count):
+            self.progress_done = imported_count
+        err, imported_count = import_catalog_dump(dump_path, CATALOG_PATH, progress_callback=on_progress)
+        self.progress_done = imported_count
+        self.finish_progress()
+
+        if err:
+            self.log_queue.put(f"ERROR: {err}\n")
+        end_time = datetime.now()
+        self.log_queue.put(f"Rows imported: {imported_count}\n")
+        self.log_queue.put(f"\n--- Catalog Import Finished ---\n")
+        self.log_queue.put(f"Total time taken: {end_time - start_time}\n")
+        self.log_queue.put(f"Timestamp: {end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+        self.after(100, lambda: self.run_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.refresh_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.compare_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.file_menu.entryconfig("Import Offline Catalog...", state=tk.NORMAL))
+        self.after(100, lambda: self.save_log_button.config(state=tk.NORMAL))
+        self.after(200, self.show_completion_popup)
+
+    def compare_dbs_in_thread(self):
+        """
+        Asks for two output databases (older and newer run) and compares them in a
+        separate thread to keep the GUI responsive.
+        """
+        old_db_path = filedialog.askopenfilename(
+            title="Select Older Output Database",
+            filetypes=[("SQLite DB", "*.db"), ("All files", "*.*")]
+        )
+        if not old_db_path:
+            return
+        new_db_path = filedialog.askopenfilename(
+            title="Select Newer Output Database",
+            initialdir=os.path.dirname(old_db_path),
+            filetypes=[("SQLite DB", "*.db"), ("All files", "*.*")]
+        )
+        if not new_db_path:
+            return
+
+        self.output_text.delete(1.0, tk.END) # Clear previous output
+
+        # Disable buttons during comparison
+        self.run_button.config(state=tk.DISABLED)
+        self.refresh_button.config(state=tk.DISABLED)
+        self.compare_button.config(state=tk.DISABLED)
+        self.file_menu.entryconfig("Import Offline Catalog...", state=tk.DISABLED)
+        self.save_log_button.config(state=tk.DISABLED)
+
+        self.actual_output_dir = None # Reset actual output directory
+
+        thread = threading.Thread(target=self._run_compare, args=(old_db_path, new_db_path))
+        thread.start()
+
+    def _run_compare(self, old_db_path, new_db_path):
+        """
+        Compares two output databases and writes the added/removed/changed report as
+        tables of a new database and as CSV files in a timestamped output folder.
+        This method runs in a separate thread.
+        """
+        script = "asp-search"
+        start_time = datetime.now()
+        time_format_filename = "%Y%m%d_%H%M%S"
+        selected_output_directory = self.output_folder_var.get()
+
+        self.log_queue.put(f"{app_name} {version}\n")
+        self.log_queue.put(f"https://github.com/stark4n6/asp-search\n")
+        self.log_queue.put(f"--- Compare Started ---\n")
+        self.log_queue.put(f"Start: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self.log_queue.put(f"Older database: {self._format_path_for_display(old_db_path)}\n")
+        self.log_queue.put(f"Newer database: {self._format_path_for_display(new_db_path)}\n\n")
+
+        base_output_dir = selected_output_directory if selected_output_directory and os.path.isdir(selected_output_directory) else os.getcwd()
+        output_dir = os.path.join(base_output_dir, f"{script}_compare_{start_time.strftime(time_format_filename)}")
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            self.actual_output_dir = output_dir
+            self.log_queue.put(f"Output folder created at: {self._format_path_for_display(output_dir)}\n")
+        except OSError as e:
+            self.log_queue.put(f"ERROR: Could not create output folder '{self._format_path_for_display(output_dir)}': {e}\n")
+
+        if self.actual_output_dir:
+            compare_db_path = os.path.join(output_dir, f"{script}_compare_{start_time.strftime(time_format_filename)}.db")
+            err, counts = compare_output_databases(old_db_path, new_db_path, compare_db_path)
+            if err:
+                self.log_queue.put(f"ERROR: {err}\n")
+            else:
+                for kind, compare_table in COMPARE_TABLE_NAMES.items():
+                    csv_path = os.path.join(output_dir, f"{compare_table}.csv")
+                    csv_err = export_table_to_csv(compare_db_path, compare_table, csv_path)
+                    if csv_err:
+                        self.log_queue.put(f"ERROR: {csv_err}\n")
+                    else:
+                        self.log_queue.put(f"{kind.capitalize()}: {counts[kind]} rows, saved to {self._format_path_for_display(csv_path)}\n")
+
+                try:
+                    conn = sqlite3.connect(compare_db_path)
+                    conn.execute(f"CREATE TABLE IF NOT EXISTS {METADATA_TABLE_NAME} (key TEXT PRIMARY KEY, value TEXT)")
+                    metadata_items = {
+                        "AppName": app_name,
+                        "Version": version,
+                        "Source": "https://github.com/stark4n6/asp-search",
+                        "CompareTime": start_time.strftime('%Y-%m-%d %H:%M:%S'),
+                        "OlderDatabase": old_db_path,
+                        "NewerDatabase": new_db_path,
+                        "AddedCount": str(counts["added"]),
+                        "RemovedCount": str(counts["removed"]),
+                        "ChangedCount": str(counts["changed"]),
+                    }
+                    for key, value in metadata_items.items():
+                        conn.execute(f"INSERT OR REPLACE INTO {METADATA_TABLE_NAME} (key, value) VALUES (?, ?)", (key, value))
+                    conn.commit()
+                    conn.close()
+                except sqlite3.Error as e:
+                    self.log_queue.put(f"Error writing metadata table: {e}\n")
+                self.log_queue.put(f"Database saved to: {self._format_path_for_display(compare_db_path)}\n")
+
+        end_time = datetime.now()
+        self.log_queue.put(f"\n--- Compare Finished ---\n")
+        self.log_queue.put(f"Total time taken: {end_time - start_time}\n")
+        self.log_queue.put(f"Timestamp: {end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        self.log_queue.put("Compare process completed.\n")
+
+        self.after(100, lambda: self.run_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.refresh_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.compare_button.config(state=tk.NORMAL))
+        self.after(100, lambda: self.file_menu.entryconfig("Import Offline Catalog...", state=tk.NORMAL))
+        self.after(100, lambda: self.save_log_button.config(state=tk.NORMAL))
+        self.after(200, self.show_completion_popup)
+
     def save_log(self):
         """
         Saves the content of the console output text widget to a file.
@@ -859,5 +2352,6 @@ class App(tk.Tk):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # Needed for the harvesting process pool in PyInstaller builds
     app = App()
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,172 @@
+import importlib.util
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+import urllib.error
+from unittest import mock
+
+# ASP-Search.py is a script with a hyphenated name, so it is loaded from its path
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ASP-Search.py")
+spec = importlib.util.spec_from_file_location("asp_search", SCRIPT_PATH)
+asp_search = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(asp_search)
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, payload, headers=None):
+        super().__init__(json.dumps(payload).encode("utf-8"))
+        self.headers = headers or {}
+
+
+class CanonicalizeInputTests(unittest.TestCase):
+    def test_adam_ids(self):
+        cases = {
+            "361309726": "361309726",
+            "https://apps.apple.com/us/app/pages/id361309726": "361309726",
+            "itms-apps://itunes.apple.com/app/id361309726?mt=8": "361309726",
+            "id12 361309726": "361309726",
+            "3,Pages,361309726": "361309726",
+        }
+        for raw_value, expected in cases.items():
+            self.assertEqual(asp_search.canonicalize_input_id(raw_value, "adamId"), (None, expected), raw_value)
+
+    def test_rejected_adam_ids(self):
+        for raw_value in ["", "42", "id123", "361309726,284882215", "1.2.3"]:
+            reason, adam_id = asp_search.canonicalize_input_id(raw_value, "adamId")
+            self.assertIsNotNone(reason, raw_value)
+            self.assertIsNone(adam_id)
+
+    def test_bundle_ids(self):
+        cases = {
+            "com.apple.Pages": "com.apple.Pages",
+            "<string>com.apple.Pages</string>": "com.apple.Pages",
+            "file.txt,com.a.b": "com.a.b",
+            "export.csv;Pages;com.apple.Pages;1.2.3": "com.apple.Pages",
+            "www.example.com com.apple.Pages": "com.apple.Pages",
+            "Pages,com.apple.Pages,COM.APPLE.PAGES": "com.apple.Pages",
+            "Pages MyCompany.Pages": "MyCompany.Pages",
+        }
+        for raw_value, expected in cases.items():
+            self.assertEqual(asp_search.canonicalize_input_id(raw_value, "bundleId"), (None, expected), raw_value)
+
+    def test_rejected_bundle_ids(self):
+        for raw_value in ["Info.plist", "example.com", "v1.2.3", "com.apple.Pages,com.apple.Numbers", "https://apps.apple.com/us/app/pages/id361309726"]:
+            reason, bundle_id = asp_search.canonicalize_input_id(raw_value, "bundleId")
+            self.assertIsNotNone(reason, raw_value)
+            self.assertIsNone(bundle_id)
+
+
+class FetchTests(unittest.TestCase):
+    payload = {"resultCount": 1, "results": [{"trackId": 284882215, "bundleId": "com.facebook.Facebook"}]}
+
+    def test_get_data_from_itunes(self):
+        with mock.patch("urllib.request.urlopen", return_value=FakeResponse(self.payload)) as urlopen:
+            err, data, error_type = asp_search.get_data_from_itunes("284882215", "adamId")
+        self.assertIsNone(err)
+        self.assertIsNone(error_type)
+        self.assertEqual(data, self.payload)
+        self.assertEqual(urlopen.call_args[0][0], "http://itunes.apple.com/lookup?id=284882215")
+
+    def test_get_data_from_itunes_timeout(self):
+        with mock.patch("urllib.request.urlopen", side_effect=urllib.error.URLError(TimeoutError("timed out"))):
+            err, data, error_type = asp_search.get_data_from_itunes("284882215", "adamId")
+        self.assertIn("284882215", err)
+        self.assertIsNone(data)
+        self.assertIs(error_type, TimeoutError)
+
+    def test_get_data_from_itunes_conditional(self):
+        headers = {"ETag": '"abc"', "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT"}
+        with mock.patch("urllib.request.urlopen", return_value=FakeResponse(self.payload, headers)) as urlopen:
+            err, data, validators = asp_search.get_data_from_itunes_conditional("com.facebook.Facebook", "bundleId", etag='"old"')
+        self.assertIsNone(err)
+        self.assertEqual(data, self.payload)
+        self.assertEqual(validators, {"etag": '"abc"', "last_modified": "Sat, 17 Oct 2026 10:00:00 GMT"})
+        request = urlopen.call_args[0][0]
+        self.assertEqual(request.full_url, "http://itunes.apple.com/lookup?bundleId=com.facebook.Facebook")
+        self.assertEqual(request.get_header("If-none-match"), '"old"')
+
+    def test_get_data_from_itunes_conditional_not_modified(self):
+        not_modified = urllib.error.HTTPError("http://itunes.apple.com/lookup?id=284882215", 304, "Not Modified", {}, None)
+        with mock.patch("urllib.request.urlopen", side_effect=not_modified):
+            err, data, validators = asp_search.get_data_from_itunes_conditional("284882215", "adamId", etag='"abc"')
+        self.assertIsNone(err)
+        self.assertIsNone(data)
+        self.assertEqual(validators["etag"], '"abc"')
+
+    def test_invalid_lookup_type(self):
+        err, data, error_type = asp_search.get_data_from_itunes("284882215", "trackName")
+        self.assertTrue(err.startswith("ERROR: Invalid lookup type"))
+        self.assertIsNone(data)
+
+
+class HedgedFetchTests(unittest.TestCase):
+    def test_exception_in_fetch_is_reported(self):
+        tracker = asp_search.LatencyTracker()
+        with mock.patch.object(asp_search, "get_data_from_itunes", side_effect=RuntimeError("boom")):
+            err, data, is_slow = asp_search.get_data_from_itunes_hedged("284882215", "adamId", tracker, True)
+        self.assertIn("boom", err)
+        self.assertIsNone(data)
+
+    def test_hung_request_is_given_up_on(self):
+        tracker = asp_search.LatencyTracker()
+        release = threading.Event()
+        with mock.patch.object(asp_search, "get_data_from_itunes", side_effect=lambda *args: release.wait()), \
+                mock.patch.object(asp_search, "REQUEST_TIMEOUT_SECONDS", 0.1), \
+                mock.patch.object(asp_search, "RESPONSE_GRACE_SECONDS", 0.1):
+            err, data, is_slow = asp_search.get_data_from_itunes_hedged("284882215", "adamId", tracker, False)
+        release.set()
+        self.assertIn("no response", err)
+        self.assertIsNone(data)
+        self.assertEqual(tracker.timeout_count, 1)
+
+
+class CatalogImportTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.catalog_path = os.path.join(self.temp_dir.name, "catalog", "catalog.db")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_dump(self, text):
+        dump_path = os.path.join(self.temp_dir.name, "dump.tsv")
+        with open(dump_path, "w", encoding="utf-8") as dump_file:
+            dump_file.write(text)
+        return dump_path
+
+    def get_index_names(self):
+        conn = sqlite3.connect(self.catalog_path)
+        try:
+            return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+        finally:
+            conn.close()
+
+    def test_import_builds_index(self):
+        err, count = asp_search.import_catalog_dump(self.write_dump("adamId\tbundleId\n284882215\tcom.facebook.Facebook\n"), self.catalog_path)
+        self.assertIsNone(err)
+        self.assertEqual(count, 1)
+        self.assertEqual(self.get_index_names(), {f"idx_{asp_search.CATALOG_TABLE_NAME}_bundleId_nocase"})
+
+    def test_bad_header_keeps_index(self):
+        asp_search.import_catalog_dump(self.write_dump("adamId\tbundleId\n284882215\tcom.facebook.Facebook\n"), self.catalog_path)
+        err, count = asp_search.import_catalog_dump(self.write_dump("name\tbundleId\nFacebook\tcom.facebook.Facebook\n"), self.catalog_path)
+        self.assertIn("No AdamID column", err)
+        self.assertEqual(self.get_index_names(), {f"idx_{asp_search.CATALOG_TABLE_NAME}_bundleId_nocase"})
+
+    def test_failed_import_rebuilds_index(self):
+        dump_path = self.write_dump("adamId\tbundleId\n284882215\tcom.facebook.Facebook\n")
+        def failing_records(dump_file, delimiter=None):
+            yield ["adamId", "bundleId"]
+            raise OSError("read error")
+        with mock.patch.object(asp_search, "iter_catalog_dump_records", failing_records):
+            err, count = asp_search.import_catalog_dump(dump_path, self.catalog_path)
+        self.assertIn("read error", err)
+        self.assertEqual(self.get_index_names(), {f"idx_{asp_search.CATALOG_TABLE_NAME}_bundleId_nocase"})
+
+
+if __name__ == "__main__":
+    unittest.main()